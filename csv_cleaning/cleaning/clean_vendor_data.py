@@ -1,24 +1,40 @@
 import pandas as pd
+import os
+import sqlite3
+import sys
 
-def clean_vendor_data(file_path, output_path=None):
+def clean_vendor_data(file_path, output_path=None, database=None, table_name='vendor_master',
+                      connect=sqlite3.connect, paramstyle='qmark'):
     """
     Cleans vendor data from the given file.
     
     Args:
         file_path (str): Path to the raw vendor data CSV file.
         output_path (str, optional): Path to save the cleaned file. If not provided, data is not saved.
+        database (str, optional): Database argument passed to connect, e.g. a SQLite file path. If not provided, no database is written.
+            The pooled connection stays open for later loads until utils.database_sink.close_connections() is called.
+        table_name (str, optional): Table to load the cleaned data into.
+        connect (callable, optional): DB-API connect function. Defaults to sqlite3.connect.
+        paramstyle (str, optional): Paramstyle of the DB-API driver ('qmark' or 'format').
 
     Returns:
         pd.DataFrame: Cleaned vendor data.
     """
+    # Imported here so this file can also be run directly as a script
+    from cleaning.standardise_reference_data import standardise_reference_data
+    from utils.database_sink import write_to_database
+
     # Load the dataset
     data = pd.read_csv(file_path)
     
     # Deduplicate based on 'vendor_id' and 'vendor_name'
     data_cleaned = data.drop_duplicates(subset=['vendor_id', 'vendor_name'], keep='first')
 
-    # Standardise capitalisation in text fields
-    text_columns = ['vendor_name', 'owner', 'address', 'city', 'country', 'email']
+    # Standardise countries, currencies and cities against the reference tables
+    data_cleaned = standardise_reference_data(data_cleaned)
+
+    # Standardise capitalisation in the remaining text fields
+    text_columns = ['vendor_name', 'owner', 'address', 'email']
     for col in text_columns:
         if col in data_cleaned.columns:
             data_cleaned[col] = data_cleaned[col].str.title()
@@ -52,10 +68,17 @@ def clean_vendor_data(file_path, output_path=None):
         data_cleaned.to_csv(output_path, index=False)
         print(f"Cleaned data saved to: {output_path}")
 
+    # Load the cleaned data into the database if one is provided
+    if database:
+        write_to_database(data_cleaned, database, table_name, connect, paramstyle)
+
     return data_cleaned
 
 # Example usage
 if __name__ == "__main__":
+    # Make the csv_cleaning packages importable when run directly as a script
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
     # Update these paths to point to your actual files
     file_path = 'csv_cleaning/data/processed/deduplicated_consolidated_vendor_data.csv'  # Update this to your input file path
     output_path = 'csv_cleaning/data/processed/cleaned_vendor_data.csv'  # Update this to your desired output path
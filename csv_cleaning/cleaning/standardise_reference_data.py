@@ -0,0 +1,200 @@
+import pandas as pd
+import numpy as np
+import os
+import re
+from functools import lru_cache
+
+# Reference tables live alongside the rest of the pipeline data
+REFERENCE_FOLDER = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'reference'
+)
+
+def lookup_key(value):
+    """
+    Reduce a raw value to the form used for reference lookups, so that
+    'STEINHAUSEN', 'Steinhausen' and 'CzechRepublic' / 'Czech Republic' match
+    """
+    return re.sub(r'[\s.\-_]+', '', str(value)).casefold()
+
+def build_lookup(table, canonical_column, *key_columns):
+    """
+    Build a {lookup key: canonical value} dictionary from a reference table,
+    including every pipe-separated alias
+    """
+    lookup = {}
+    for _, row in table.iterrows():
+        names = [row[col] for col in key_columns] + row['aliases'].split('|')
+        for name in names:
+            if name.strip():
+                lookup.setdefault(lookup_key(name), row[canonical_column])
+    return lookup
+
+# Reference file versions the memoised lookups were built from, per reference folder
+_loaded_versions = {}
+
+def reference_version(reference_folder=REFERENCE_FOLDER):
+    """
+    Return the modification time and size of each reference table, used to
+    detect edits to the tables within the same session
+    """
+    version = []
+    for file_name in ['countries.csv', 'currencies.csv', 'cities.csv']:
+        stat = os.stat(os.path.join(reference_folder, file_name))
+        version.append((stat.st_mtime_ns, stat.st_size))
+    return tuple(version)
+
+def load_reference_tables(reference_folder=REFERENCE_FOLDER):
+    """
+    Return the reference lookup dictionaries, clearing the memoised lookups
+    if the reference tables have changed since they were loaded. The lookups
+    themselves do not re-check the files, so call this before using them.
+    """
+    version = reference_version(reference_folder)
+    if _loaded_versions.get(reference_folder) != version:
+        for cached in [read_reference_tables, country_code, standardise_country,
+                       standardise_currency, standardise_city]:
+            cached.cache_clear()
+        _loaded_versions[reference_folder] = version
+    return read_reference_tables(reference_folder)
+
+@lru_cache(maxsize=None)
+def read_reference_tables(reference_folder=REFERENCE_FOLDER):
+    """
+    Load the country, currency and city reference tables into lookup dictionaries
+    """
+    countries = pd.read_csv(os.path.join(reference_folder, 'countries.csv'), dtype=str, keep_default_na=False)
+    currencies = pd.read_csv(os.path.join(reference_folder, 'currencies.csv'), dtype=str, keep_default_na=False)
+    cities = pd.read_csv(os.path.join(reference_folder, 'cities.csv'), dtype=str, keep_default_na=False)
+
+    country_codes = build_lookup(countries, 'iso_code', 'iso_code', 'country_name')
+    country_names = dict(zip(countries['iso_code'], countries['country_name']))
+    currency_codes = build_lookup(currencies, 'currency_code', 'currency_code', 'currency_name')
+
+    # Cities are canonicalised within the country they belong to first
+    city_names = {
+        iso_code: build_lookup(group, 'city', 'city')
+        for iso_code, group in cities.groupby('iso_code')
+    }
+
+    # Fallback across all countries, only for keys that resolve to a single city
+    city_candidates = {}
+    for lookup in city_names.values():
+        for key, city in lookup.items():
+            city_candidates.setdefault(key, set()).add(city)
+    any_country_city_names = {
+        key: candidates.pop() for key, candidates in city_candidates.items() if len(candidates) == 1
+    }
+
+    return {
+        'country_codes': country_codes,
+        'country_names': country_names,
+        'currency_codes': currency_codes,
+        'city_names': city_names,
+        'any_country_city_names': any_country_city_names,
+    }
+
+@lru_cache(maxsize=None)
+def country_code(value, reference_folder=REFERENCE_FOLDER):
+    """
+    Return the ISO code for a country name, alias or code, or None if unknown
+    """
+    return read_reference_tables(reference_folder)['country_codes'].get(lookup_key(value))
+
+@lru_cache(maxsize=None)
+def standardise_country(value, reference_folder=REFERENCE_FOLDER):
+    """
+    Return the canonical country name, falling back to title case if unknown
+    """
+    iso_code = country_code(value, reference_folder)
+    if iso_code is None:
+        return str(value).strip().title()
+    return read_reference_tables(reference_folder)['country_names'][iso_code]
+
+@lru_cache(maxsize=None)
+def standardise_currency(value, reference_folder=REFERENCE_FOLDER):
+    """
+    Return the ISO currency code, falling back to upper case if unknown
+    """
+    code = read_reference_tables(reference_folder)['currency_codes'].get(lookup_key(value))
+    return code if code is not None else str(value).strip().upper()
+
+@lru_cache(maxsize=None)
+def standardise_city(value, iso_code, reference_folder=REFERENCE_FOLDER):
+    """
+    Return the canonical city name for the given country. If the country has no
+    match, fall back to a city that is unambiguous across all countries, then title case.
+    """
+    tables = read_reference_tables(reference_folder)
+    key = lookup_key(value)
+    city = tables['city_names'].get(iso_code, {}).get(key)
+    if city is None:
+        city = tables['any_country_city_names'].get(key)
+    return city if city is not None else str(value).strip().title()
+
+def map_distinct(series, standardise):
+    """
+    Apply a standardisation function once per distinct value and map the
+    results back over the column. Missing values are left untouched.
+    """
+    codes, uniques = pd.factorize(series)
+    standardised = np.array([standardise(value) for value in uniques] + [np.nan], dtype=object)
+    # Missing values have code -1, which picks the trailing NaN
+    return pd.Series(standardised[codes], index=series.index, dtype=object)
+
+def map_distinct_pairs(values, groups, standardise):
+    """
+    Like map_distinct, but for values that are standardised within a group
+    (e.g. cities within a country). Each distinct pair is looked up once.
+    """
+    value_codes, value_uniques = pd.factorize(values)
+    group_codes, group_uniques = pd.factorize(groups)
+
+    # Combine both codes into a single integer key per row
+    pair_keys = value_codes.astype(np.int64) * (len(group_uniques) + 1) + (group_codes + 1)
+    pair_codes, pair_uniques = pd.factorize(pair_keys)
+
+    standardised = []
+    for pair_key in pair_uniques:
+        value_code, group_code = divmod(int(pair_key), len(group_uniques) + 1)
+        if value_code < 0:
+            standardised.append(np.nan)
+        else:
+            group = group_uniques[group_code - 1] if group_code > 0 else None
+            standardised.append(standardise(value_uniques[value_code], group))
+
+    return pd.Series(np.array(standardised, dtype=object)[pair_codes], index=values.index, dtype=object)
+
+def standardise_reference_data(data, reference_folder=REFERENCE_FOLDER):
+    """
+    Standardise countries, currencies and cities against the local reference tables.
+
+    Args:
+        data (pd.DataFrame): Vendor data using the standard field names.
+        reference_folder (str, optional): Folder holding countries.csv, currencies.csv and cities.csv.
+
+    Returns:
+        pd.DataFrame: Copy of the data with reference fields standardised.
+    """
+    # Pick up any edits to the reference tables before using the memoised lookups
+    load_reference_tables(reference_folder)
+
+    data = data.copy()
+
+    for col in ['country', 'bank_country']:
+        if col in data.columns:
+            data[col] = map_distinct(data[col], lambda value: standardise_country(value, reference_folder))
+
+    if 'currency' in data.columns:
+        data['currency'] = map_distinct(data['currency'], lambda value: standardise_currency(value, reference_folder))
+
+    if 'city' in data.columns:
+        if 'country' in data.columns:
+            iso_codes = map_distinct(data['country'], lambda value: country_code(value, reference_folder))
+        else:
+            iso_codes = pd.Series(np.nan, index=data.index, dtype=object)
+        data['city'] = map_distinct_pairs(
+            data['city'], iso_codes,
+            lambda value, iso_code: standardise_city(value, iso_code, reference_folder)
+        )
+
+    return data
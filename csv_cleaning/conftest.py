@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Lets the tests import the csv_cleaning packages (cleaning, mapping, utils) from any working directory
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
@@ -1,48 +1,125 @@
 import os
+import sqlite3
+import pandas as pd
 from mapping.refresh_mapping_matrix import refresh_mapping_matrix
-from utils.data_consolidation import consolidate_data
+from utils.data_consolidation import consolidate_data, find_latest_mapping_file
+from utils.database_sink import close_connections, write_to_database
+from utils.stage_cache import code_version, invalidate_stage, prune_cache, run_cached_stage
 from cleaning.deduplicate_and_consolidate import deduplicate_and_consolidate
 from cleaning.clean_vendor_data import clean_vendor_data
+from cleaning.standardise_reference_data import REFERENCE_FOLDER, standardise_reference_data
 
-def run_post_mapping_process():
+# Names of the cached post-mapping stages, usable with invalidate_stages
+CACHED_STAGES = ['consolidate', 'deduplicate', 'clean']
+
+def run_post_mapping_process(use_cache=True, invalidate_stages=None, max_cache_entries=20,
+                             database=None, table_name='vendor_master', connect=sqlite3.connect,
+                             paramstyle='qmark'):
     """
     Runs all processes needed after manual mapping check:
     1. Refresh mapping matrix
     2. Consolidate data
     3. Deduplicate and consolidate
     4. Clean vendor data
+    5. Load the vendor master into a database (optional)
+
+    Steps 2-4 are cached on their input files, the mapping file and their code
+    version, so unchanged stages are skipped and their previous outputs reused.
+
+    Args:
+        use_cache (bool, optional): Reuse cached stage outputs where possible.
+        invalidate_stages (list, optional): Stages from CACHED_STAGES to force re-running.
+        max_cache_entries (int, optional): Number of cache entries kept after the run (LRU).
+        database (str, optional): Database argument passed to connect, e.g. a SQLite file path.
+            If not provided, the vendor master is not loaded into a database.
+        table_name (str, optional): Table to load the vendor master into.
+        connect (callable, optional): DB-API connect function. Defaults to sqlite3.connect.
+        paramstyle (str, optional): Paramstyle of the DB-API driver ('qmark' or 'format').
     """
     try:
         print("=== Starting Post-Mapping Process ===")
-        
+
         # Get project paths
         current_dir = os.path.dirname(os.path.abspath(__file__))
         processed_dir = os.path.join(current_dir, "data", "processed")
-        
+        cleaned_dir = os.path.join(current_dir, "data", "raw", "cleaned")
+        mapping_dir = os.path.join(current_dir, "mapping", "mapping_output")
+
+        consolidated_file = os.path.join(processed_dir, "standardised_master_consolidated_data.csv")
+        deduplicated_file = os.path.join(processed_dir, "deduplicated_consolidated_vendor_data.csv")
+        output_file = os.path.join(processed_dir, "cleaned_vendor_data.csv")
+
+        for stage_name in invalidate_stages or []:
+            if stage_name not in CACHED_STAGES:
+                raise ValueError(f"Unknown stage '{stage_name}'. Expected one of: {', '.join(CACHED_STAGES)}")
+            invalidate_stage(stage_name)
+
+        def run_stage(stage_name, input_paths, output_path, version, stage):
+            if use_cache:
+                run_cached_stage(stage_name, input_paths, [output_path], version, stage)
+            else:
+                stage()
+
         # Step 1: Refresh mapping matrix
         print("\n1. Refreshing mapping matrix...")
         refresh_mapping_matrix()
-        
+
         # Step 2: Consolidate data
         print("\n2. Consolidating data...")
-        consolidate_data()
-        
+        cleaned_files = [
+            os.path.join(cleaned_dir, f) for f in os.listdir(cleaned_dir) if f.endswith('.csv')
+        ]
+        run_stage(
+            'consolidate',
+            cleaned_files + [find_latest_mapping_file(mapping_dir)],
+            consolidated_file,
+            code_version(consolidate_data),
+            consolidate_data
+        )
+
         # Step 3: Deduplicate and consolidate
         print("\n3. Deduplicating consolidated data...")
-        deduplicate_and_consolidate()
-        
+        run_stage(
+            'deduplicate',
+            [consolidated_file],
+            deduplicated_file,
+            code_version(deduplicate_and_consolidate),
+            deduplicate_and_consolidate
+        )
+
         # Step 4: Final vendor data cleaning
         print("\n4. Performing final vendor data cleaning...")
-        input_file = os.path.join(processed_dir, "deduplicated_consolidated_vendor_data.csv")
-        output_file = os.path.join(processed_dir, "cleaned_vendor_data.csv")
-        clean_vendor_data(input_file, output_file)
-        
+        reference_files = [
+            os.path.join(REFERENCE_FOLDER, f) for f in os.listdir(REFERENCE_FOLDER) if f.endswith('.csv')
+        ]
+        run_stage(
+            'clean',
+            [deduplicated_file] + reference_files,
+            output_file,
+            code_version(clean_vendor_data, standardise_reference_data),
+            lambda: clean_vendor_data(deduplicated_file, output_file)
+        )
+
+        # Step 5: Load the vendor master into the database
+        # Loaded from the final output so it also runs when cleaning was restored from the cache
+        if database:
+            print("\n5. Loading vendor master into database...")
+            write_to_database(pd.read_csv(output_file, dtype=str), database, table_name, connect, paramstyle)
+
+        if use_cache:
+            prune_cache(max_cache_entries)
+
         print("\n=== Post-Mapping Process Complete ===")
         print(f"Final output file: {output_file}")
-        
+
     except Exception as e:
         print(f"\nError in post-mapping process: {str(e)}")
         raise
 
+    finally:
+        # Release the pooled database connections once the pipeline finishes
+        if database:
+            close_connections()
+
 if __name__ == "__main__":
     run_post_mapping_process()
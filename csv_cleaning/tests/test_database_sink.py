@@ -0,0 +1,116 @@
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from utils.database_sink import close_connections, write_to_database
+
+
+class FailingCursor:
+    """
+    Cursor wrapper that fails on the second executemany batch
+    """
+    def __init__(self, cursor):
+        self.cursor = cursor
+        self.batches = 0
+
+    def executemany(self, sql, rows):
+        self.batches += 1
+        if self.batches > 1:
+            raise sqlite3.OperationalError("simulated failure mid-load")
+        return self.cursor.executemany(sql, rows)
+
+    def __getattr__(self, name):
+        return getattr(self.cursor, name)
+
+
+class FailingConnection:
+    """
+    Connection wrapper whose cursors fail part way through a batched load
+    """
+    def __init__(self, database):
+        self.connection = sqlite3.connect(database)
+
+    def cursor(self):
+        return FailingCursor(self.connection.cursor())
+
+    def __getattr__(self, name):
+        return getattr(self.connection, name)
+
+
+class AutocommitConnection:
+    autocommit = True
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def database(tmp_path):
+    yield str(tmp_path / 'vendor_master.db')
+    close_connections()
+
+
+@pytest.fixture
+def vendors():
+    return pd.DataFrame({
+        'vendor_id': ['CHE222261314', 'BE987587369', '627481305'],
+        'vendor_name': ['Aurelius', 'Enterprises Wellness Logistics', None],
+        'group': ['Suppliers', 'Suppliers', 'Suppliers'],
+    })
+
+
+def read_table(database):
+    with sqlite3.connect(database) as connection:
+        rows = connection.execute("SELECT * FROM vendor_master ORDER BY vendor_id").fetchall()
+        names = {row[0] for row in connection.execute("SELECT name FROM sqlite_master")}
+    return rows, names
+
+
+def test_load_creates_table_and_indexes(database, vendors):
+    assert write_to_database(vendors, database) == 3
+
+    rows, names = read_table(database)
+    assert rows == [
+        ('627481305', None, 'Suppliers'),
+        ('BE987587369', 'Enterprises Wellness Logistics', 'Suppliers'),
+        ('CHE222261314', 'Aurelius', 'Suppliers'),
+    ]
+    assert names == {'vendor_master', 'idx_vendor_master_vendor_id', 'idx_vendor_master_vendor_name'}
+
+
+def test_reload_replaces_table(database, vendors):
+    write_to_database(vendors, database)
+    write_to_database(vendors.head(1), database)
+
+    rows, names = read_table(database)
+    assert rows == [('CHE222261314', 'Aurelius', 'Suppliers')]
+    assert 'vendor_master_staging' not in names
+
+
+def test_failure_mid_batch_keeps_previous_table(database, vendors):
+    write_to_database(vendors, database)
+    close_connections()
+
+    with pytest.raises(sqlite3.OperationalError):
+        write_to_database(vendors.head(2), database, connect=FailingConnection, batch_size=1)
+
+    rows, names = read_table(database)
+    assert len(rows) == 3
+    assert 'vendor_master_staging' not in names
+
+
+def test_failure_in_index_creation_keeps_previous_table(database, vendors):
+    write_to_database(vendors, database)
+
+    with pytest.raises(sqlite3.OperationalError):
+        write_to_database(vendors.head(1), database, index_columns=('vendor_id', 'vendor_id'))
+
+    rows, names = read_table(database)
+    assert len(rows) == 3
+    assert 'idx_vendor_master_vendor_id' in names
+
+
+def test_autocommit_connection_is_refused(database, vendors):
+    with pytest.raises(ValueError, match="autocommit"):
+        write_to_database(vendors, database, connect=lambda database: AutocommitConnection())
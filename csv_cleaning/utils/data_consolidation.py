@@ -1,5 +1,6 @@
 import pandas as pd
 import os
+import re
 
 # Function to ensure unique column names
 def make_unique_columns(columns):
@@ -14,13 +15,31 @@ def make_unique_columns(columns):
             new_columns.append(col)
     return new_columns
 
-def consolidate_data():
-    # Get the project root directory
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    project_root = os.path.dirname(current_dir)
-    
-    # Load the mapping file from the mapping output folder
-    mapping_folder = os.path.join(project_root, 'mapping', 'mapping_output')
+def get_source_mapping(mapping_df, source):
+    """
+    Build the {source field: standard field} lookup for a single source,
+    leaving out any fields still marked as UNMAPPED
+    """
+    source_rows = mapping_df[
+        (mapping_df['Source'] == source) & (mapping_df['Standard Field'] != 'UNMAPPED')
+    ]
+    return dict(zip(source_rows['Source Field'], source_rows['Standard Field']))
+
+def mapped_source_field(col, source_mapping):
+    """
+    Return the mapped source field a column was read as, or None if it is not mapped.
+    pandas reads a repeated header as 'Name.1', 'Name.2', ..., so these are
+    matched back to their base field.
+    """
+    if col in source_mapping:
+        return col
+    base_col = re.sub(r'\.\d+$', '', col)
+    return base_col if base_col in source_mapping else None
+
+def find_latest_mapping_file(mapping_folder):
+    """
+    Return the path of the most recent field mapping file in the mapping output folder
+    """
     mapping_files = [f for f in os.listdir(mapping_folder) 
                     if f.startswith('field_mapping') and f.endswith('.csv')]
 
@@ -31,11 +50,25 @@ def consolidate_data():
         raise ValueError("No field mapping files found. Please ensure there are files starting with 'field_mapping' in the mapping_output directory")
 
     latest_mapping_file = max(mapping_files)
-    mapping_file_path = os.path.join(mapping_folder, latest_mapping_file)
+    return os.path.join(mapping_folder, latest_mapping_file)
+
+def consolidate_data():
+    # Get the project root directory
+    current_dir = os.path.dirname(os.path.abspath(__file__))
+    project_root = os.path.dirname(current_dir)
+    
+    # Load the mapping file from the mapping output folder
+    mapping_folder = os.path.join(project_root, 'mapping', 'mapping_output')
+    mapping_file_path = find_latest_mapping_file(mapping_folder)
 
     mapping_df = pd.read_csv(mapping_file_path)
 
-    # Create a dictionary to map source field names to standard field names
+    # Standard fields every consolidated record should carry
+    standard_fields = [
+        field for field in mapping_df['Standard Field'].unique() if field != 'UNMAPPED'
+    ]
+
+    # Mapping of source field names to standard field names across all sources
     mapping_dict = pd.Series(mapping_df['Standard Field'].values, index=mapping_df['Source Field']).to_dict()
 
     # Get paths to cleaned CSV files
@@ -46,29 +79,47 @@ def consolidate_data():
         if f.endswith('.csv')
     ]
 
-    # Initialise a DataFrame for the standardised and consolidated data
-    standardised_consolidated_data = pd.DataFrame()
+    # Collect the standardised frames and concatenate them once at the end
+    standardised_frames = []
 
     # Process each cleaned file
     for file_path in cleaned_files_paths:
         print(f"Processing: {os.path.basename(file_path)}")
-        # Load the cleaned data
-        temp_df = pd.read_csv(file_path)
+        source = os.path.basename(file_path).replace('cleaned_', '').replace('.csv', '')
+        source_mapping = get_source_mapping(mapping_df, source)
+
+        if source_mapping:
+            # Only parse the columns this source maps onto a standard field
+            temp_df = pd.read_csv(
+                file_path, usecols=lambda col: mapped_source_field(col, source_mapping) is not None
+            )
+            standardised_columns = [
+                source_mapping[mapped_source_field(col, source_mapping)] for col in temp_df.columns
+            ]
+        else:
+            # No mapping rows for this source yet, so map its fields by name across all sources
+            print(f"Warning: No mapping rows found for source '{source}', mapping fields by name instead")
+            temp_df = pd.read_csv(file_path)
+            standardised_columns = [mapping_dict.get(col, col) for col in temp_df.columns]
         
         # Standardise column names using the mapping file
-        standardised_columns = {col: mapping_dict.get(col, col) for col in temp_df.columns}
-        temp_df.rename(columns=standardised_columns, inplace=True)
-        
-        # Add missing columns from the mapping file if not present in the cleaned file
-        for required_field in mapping_df['Standard Field'].unique():
-            if required_field not in temp_df.columns:
-                temp_df[required_field] = pd.NA  # Fill missing fields with NaN
+        temp_df.columns = make_unique_columns(standardised_columns)
         
-        # Ensure unique column names
-        temp_df.columns = make_unique_columns(temp_df.columns)
-        
-        # Append to the consolidated DataFrame
-        standardised_consolidated_data = pd.concat([standardised_consolidated_data, temp_df], ignore_index=True)
+        standardised_frames.append(temp_df)
+
+    # Build the full standard schema in first-seen order, keeping any extra columns
+    # produced when several source fields map to the same standard field
+    schema = list(dict.fromkeys(
+        col for frame in standardised_frames for col in list(frame.columns) + standard_fields
+    ))
+
+    # Pad each frame to the schema with pd.NA so integer columns are not cast to float,
+    # then concatenate them in a single step
+    standardised_frames = [frame.reindex(columns=schema, fill_value=pd.NA) for frame in standardised_frames]
+    if standardised_frames:
+        standardised_consolidated_data = pd.concat(standardised_frames, ignore_index=True)
+    else:
+        standardised_consolidated_data = pd.DataFrame(columns=schema)
 
     # Create processed folder if it doesn't exist
     processed_folder = os.path.join(project_root, 'data', 'processed')
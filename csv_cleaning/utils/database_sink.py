@@ -0,0 +1,127 @@
+import sqlite3
+
+# Open connections, keyed by connect function and database, reused across loads
+_connection_pool = {}
+
+# Placeholder for each DB-API paramstyle supported by the bulk insert
+PLACEHOLDERS = {'qmark': '?', 'format': '%s'}
+
+def get_connection(database, connect=sqlite3.connect):
+    """
+    Return a pooled DB-API connection for the database, opening one if needed
+    """
+    pool_key = (connect, database)
+    if pool_key not in _connection_pool:
+        _connection_pool[pool_key] = connect(database)
+    return _connection_pool[pool_key]
+
+def close_connections():
+    """
+    Close every pooled connection
+    """
+    while _connection_pool:
+        _, connection = _connection_pool.popitem()
+        connection.close()
+
+def quote_identifier(name):
+    """
+    Quote a table or column name for use in SQL (e.g. the 'group' field)
+    """
+    return '"' + str(name).replace('"', '""') + '"'
+
+def as_text(data):
+    """
+    Convert every value to its text form, with missing values as None, so the
+    table matches the CSV output whether it is loaded from a file or a DataFrame
+    """
+    return data.astype(object).where(data.notna(), None).apply(
+        lambda col: col.map(lambda value: None if value is None else str(value))
+    )
+
+def write_to_database(data, database, table_name='vendor_master', connect=sqlite3.connect,
+                      paramstyle='qmark', batch_size=1000, index_columns=('vendor_id', 'vendor_name')):
+    """
+    Bulk load vendor data into a SQL table in a single transaction.
+
+    The data is loaded into a staging table which is then swapped in place of
+    the live table, so readers never see a partially loaded master. All columns
+    are stored as TEXT, matching the CSV output.
+
+    The swap is only atomic on databases with transactional DDL, such as SQLite
+    and PostgreSQL. On MySQL, DROP/CREATE/RENAME commit implicitly. Connections
+    in autocommit mode are refused.
+
+    Args:
+        data (pd.DataFrame): Vendor data to load.
+        database (str): Database passed to the connect function, e.g. a SQLite file path.
+        table_name (str, optional): Name of the live table.
+        connect (callable, optional): DB-API connect function, called with database.
+            Defaults to sqlite3.connect. Must return a connection that is not in
+            autocommit mode and, for an atomic swap, supports transactional DDL.
+        paramstyle (str, optional): Paramstyle of the DB-API driver ('qmark' or 'format').
+        batch_size (int, optional): Number of rows per executemany batch.
+        index_columns (tuple, optional): Columns to index once the load is complete.
+
+    Returns:
+        int: Number of rows loaded.
+    """
+    if paramstyle not in PLACEHOLDERS:
+        raise ValueError(f"Unsupported paramstyle '{paramstyle}'. Expected one of: {', '.join(PLACEHOLDERS)}")
+
+    connection = get_connection(database, connect)
+    if getattr(connection, 'autocommit', False) is True:
+        raise ValueError("The database connection is in autocommit mode, so the load cannot run in one transaction")
+    cursor = connection.cursor()
+
+    table = quote_identifier(table_name)
+    staging_table = quote_identifier(f"{table_name}_staging")
+    old_table = quote_identifier(f"{table_name}_old")
+
+    columns = ', '.join(f"{quote_identifier(col)} TEXT" for col in data.columns)
+    placeholders = ', '.join([PLACEHOLDERS[paramstyle]] * len(data.columns))
+    insert_sql = f"INSERT INTO {staging_table} VALUES ({placeholders})"
+
+    # Missing values are written as NULL
+    rows = as_text(data).itertuples(index=False, name=None)
+
+    try:
+        # sqlite3 does not open a transaction before DDL on its own
+        if getattr(connection, 'in_transaction', None) is False:
+            cursor.execute("BEGIN")
+
+        cursor.execute(f"DROP TABLE IF EXISTS {staging_table}")
+        cursor.execute(f"CREATE TABLE {staging_table} ({columns})")
+
+        # Insert the rows in batches
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= batch_size:
+                cursor.executemany(insert_sql, batch)
+                batch = []
+        if batch:
+            cursor.executemany(insert_sql, batch)
+
+        # Swap the staging table in place of the live table
+        cursor.execute(f"DROP TABLE IF EXISTS {old_table}")
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} ({columns})")
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {old_table}")
+        cursor.execute(f"ALTER TABLE {staging_table} RENAME TO {table}")
+        cursor.execute(f"DROP TABLE {old_table}")
+
+        # Create indexes once the data is loaded
+        for col in index_columns:
+            if col in data.columns:
+                index_name = quote_identifier(f"idx_{table_name}_{col}")
+                cursor.execute(f"CREATE INDEX {index_name} ON {table} ({quote_identifier(col)})")
+
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+    finally:
+        cursor.close()
+
+    print(f"Loaded {len(data)} records into table '{table_name}' in {database}")
+
+    return len(data)
@@ -0,0 +1,111 @@
+import hashlib
+import inspect
+import os
+import shutil
+
+# Bump this to invalidate every cached stage after a change to the cache layout
+CACHE_VERSION = '1'
+
+# Default location of the stage cache
+CACHE_FOLDER = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'cache'
+)
+
+def file_hash(file_path):
+    """
+    Return the SHA-256 hash of a file's contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def code_version(*functions):
+    """
+    Return a hash of the source files defining the given functions, so that
+    editing a stage's code invalidates its cached outputs
+    """
+    digest = hashlib.sha256(CACHE_VERSION.encode())
+    for func in functions:
+        digest.update(file_hash(inspect.getsourcefile(func)).encode())
+    return digest.hexdigest()
+
+def stage_key(stage_name, input_paths, version):
+    """
+    Build the cache key for a stage from its input artifacts and code/config version
+    """
+    digest = hashlib.sha256(f"{stage_name}:{version}".encode())
+    for path in sorted(input_paths):
+        digest.update(os.path.basename(path).encode())
+        digest.update(file_hash(path).encode())
+    return digest.hexdigest()
+
+def run_cached_stage(stage_name, input_paths, output_paths, version, run_stage, cache_folder=CACHE_FOLDER):
+    """
+    Run a pipeline stage, or restore its outputs from the cache if the inputs
+    and version are unchanged since a previous run.
+
+    Args:
+        stage_name (str): Name of the stage, used as the cache sub-folder.
+        input_paths (list): Files the stage reads.
+        output_paths (list): Files the stage writes.
+        version (str): Code/config version of the stage, e.g. from code_version().
+        run_stage (callable): Runs the stage and writes its outputs.
+        cache_folder (str, optional): Root folder of the stage cache.
+
+    Returns:
+        bool: True if the outputs were restored from the cache.
+    """
+    key = stage_key(stage_name, input_paths, version)
+    entry_folder = os.path.join(cache_folder, stage_name, key)
+    cached_paths = [os.path.join(entry_folder, os.path.basename(path)) for path in output_paths]
+
+    if all(os.path.exists(path) for path in cached_paths):
+        for cached_path, output_path in zip(cached_paths, output_paths):
+            os.makedirs(os.path.dirname(output_path), exist_ok=True)
+            shutil.copy2(cached_path, output_path)
+        # Mark the entry as recently used for LRU cleanup
+        os.utime(entry_folder)
+        print(f"Cache hit for '{stage_name}', reusing cached outputs")
+        return True
+
+    run_stage()
+
+    # Store the outputs under a temporary folder first so a failed copy never leaves a partial entry
+    temp_folder = entry_folder + '.tmp'
+    shutil.rmtree(temp_folder, ignore_errors=True)
+    os.makedirs(temp_folder)
+    for output_path in output_paths:
+        shutil.copy2(output_path, os.path.join(temp_folder, os.path.basename(output_path)))
+    shutil.rmtree(entry_folder, ignore_errors=True)
+    os.replace(temp_folder, entry_folder)
+
+    return False
+
+def invalidate_stage(stage_name, cache_folder=CACHE_FOLDER):
+    """
+    Remove every cached entry for a stage
+    """
+    stage_folder = os.path.join(cache_folder, stage_name)
+    if os.path.exists(stage_folder):
+        shutil.rmtree(stage_folder)
+        print(f"Invalidated cache for '{stage_name}'")
+
+def prune_cache(max_entries, cache_folder=CACHE_FOLDER):
+    """
+    Keep only the most recently used cache entries across all stages
+    """
+    if not os.path.exists(cache_folder):
+        return
+
+    entries = [
+        os.path.join(cache_folder, stage_name, key)
+        for stage_name in os.listdir(cache_folder)
+        if os.path.isdir(os.path.join(cache_folder, stage_name))
+        for key in os.listdir(os.path.join(cache_folder, stage_name))
+    ]
+    entries.sort(key=os.path.getmtime, reverse=True)
+
+    for entry_folder in entries[max_entries:]:
+        shutil.rmtree(entry_folder, ignore_errors=True)